@@ -0,0 +1,39 @@
+# api/health_routes.py
+from fastapi import APIRouter, Request
+from api.responses import FastJSONResponse
+
+# Probe endpoints are unversioned and mounted at the application root
+router = APIRouter(default_response_class=FastJSONResponse)
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness probe.
+
+    Returns 200 as long as the process is serving requests, even while
+    dependencies are still warming up.
+    """
+    return {"status": "ok"}
+
+@router.get("/readyz")
+async def readyz(request: Request):
+    """
+    Readiness probe.
+
+    Returns 200 once every required dependency (credential, secrets, HTTP pool, shared state)
+    has warmed up, and 503 until then. The body reports each dependency's state,
+    including optional ones such as the DB pool, and the import times measured at startup.
+
+    :param request: Incoming request, used to reach the application state.
+    :return: Readiness status, per-dependency state and import timings.
+    """
+    readiness = request.app.state.readiness
+    ready = readiness.is_ready
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "dependencies": readiness.snapshot(),
+            "import_ms": request.app.state.import_timings,
+        },
+    )
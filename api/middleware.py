@@ -1,9 +1,10 @@
 # api/middleware.py
+from starlette.applications import Starlette
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 from common.logging import CorrelationIdContext, get_logger
-from collections import defaultdict
-from fastapi import HTTPException
+from domain.exceptions import SharedStateError
 import time
 
 
@@ -11,30 +12,60 @@ logger = get_logger(__name__)
 
 
 class RateLimitingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, max_requests=10, window_seconds=60):
+    """
+    Limits each client IP to `max_requests` per fixed window of `window_seconds`.
+
+    Counters live in the application's shared state store (app.state.shared_state),
+    so the limit holds across all workers and replicas using the same store.
+    If the store is unreachable, requests are let through.
+
+    Responses carry X-RateLimit-Limit, X-RateLimit-Remaining and X-RateLimit-Reset
+    (end of the current window, in epoch seconds).
+    """
+
+    def __init__(self, app, max_requests=10, window_seconds=60, exempt_paths=("/healthz", "/readyz")):
         super().__init__(app)
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = defaultdict(list)
+        self.exempt_paths = frozenset(exempt_paths)
 
     async def dispatch(self, request: Request, call_next):
+        # Load balancer probes must never be throttled
+        if request.url.path in self.exempt_paths:
+            return await call_next(request)
+
         client_ip = request.client.host
-        current_time = time.time()
-        request_times = self.requests[client_ip]
+        window = int(time.time() // self.window_seconds)
 
-        # Purge requests outside the window
-        self.requests[client_ip] = [t for t in request_times if t > current_time - self.window_seconds]
+        try:
+            count = await request.app.state.shared_state.incr(
+                f"ratelimit:{client_ip}:{window}", ttl_seconds=self.window_seconds
+            )
+        except SharedStateError as e:
+            logger.error(f"Rate limit store unavailable, allowing request: {e}")
+            return await call_next(request)
 
-        if len(self.requests[client_ip]) >= self.max_requests:
-            raise HTTPException(status_code=429, detail="Too many requests")
+        headers = {
+            "X-RateLimit-Limit": str(self.max_requests),
+            "X-RateLimit-Remaining": str(max(0, self.max_requests - count)),
+            "X-RateLimit-Reset": str((window + 1) * self.window_seconds),
+        }
+        if count > self.max_requests:
+            return JSONResponse(status_code=429, content={"detail": "Too many requests"}, headers=headers)
 
-        self.requests[client_ip].append(current_time)
-        return await call_next(request)
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
 
 
 class CorrelationMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        correlation_id = CorrelationIdContext.new_id()
+        # Keep the caller's ID when one is given, so a request can be traced across replicas
+        incoming_id = request.headers.get("X-Correlation-ID")
+        if incoming_id:
+            correlation_id = CorrelationIdContext.set(incoming_id)
+        else:
+            correlation_id = CorrelationIdContext.new_id()
         logger.info(f"CorrelationMiddleware: Assigned ID {correlation_id} to request")
         request.state.correlation_id = correlation_id
         response = await call_next(request)
@@ -48,4 +79,20 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         process_time = (time.perf_counter() - start_time) * 1000
         logger.info(f"{request.method} {request.url.path} completed in {process_time:.2f} ms")
-        return response
\ No newline at end of file
+        return response
+
+
+def add_middlewares(app: Starlette, max_requests: int, window_seconds: int) -> None:
+    """
+    Registers the middlewares in order. The last one added is the outermost, and a
+    correlation ID set inside a middleware is only visible to the ones it wraps, so
+    CorrelationMiddleware goes last: request logs and 429 responses carry the ID.
+
+    Args:
+        app (Starlette): Application to register the middlewares on.
+        max_requests (int): Requests allowed per client IP within the rate-limit window.
+        window_seconds (int): Length of the rate-limit window.
+    """
+    app.add_middleware(RateLimitingMiddleware, max_requests=max_requests, window_seconds=window_seconds)
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(CorrelationMiddleware)
@@ -0,0 +1,35 @@
+# api/responses.py
+
+"""
+Response helpers for the API layer.
+
+Includes:
+- `FastJSONResponse`: the default response class for versioned routers (ORJSON-backed).
+- `trusted_response`: wraps a DTO built by the application layer in a response
+  without FastAPI validating and encoding it a second time.
+"""
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# ORJSON renders dicts of str/float/bool/None natively and is several times faster
+# than the stdlib `json` encoder used by JSONResponse.
+FastJSONResponse = ORJSONResponse
+
+
+def trusted_response(dto: BaseModel, status_code: int = 200) -> ORJSONResponse:
+    """
+    Serializes a DTO that was already validated when it was constructed.
+
+    Returning a Response instance from a route makes FastAPI skip the
+    `response_model` validation and `jsonable_encoder` pass; the route's
+    `response_model` is still used for the OpenAPI schema.
+
+    Args:
+        dto (BaseModel): DTO built by the application layer (e.g. by VisionService).
+        status_code (int): HTTP status code of the response.
+
+    Returns:
+        ORJSONResponse: Response with the DTO rendered by orjson.
+    """
+    return FastJSONResponse(content=dto.model_dump(), status_code=status_code)
@@ -1,25 +1,31 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from application.dto.defect_result_dto import DefectResultDTO
 from application.dto.image_request_dto import ImageRequestDTO
 from application.services.vision_service import VisionService
-from infrastructure.azure_vision_analyzer import AzureVisionAnalyzer
-from infrastructure.fabric_repository import FabricRepository
 from common.config import settings
+from api.responses import FastJSONResponse, trusted_response
 
-# Create a router instance for vision-related API endpoints
-router = APIRouter()
+# Create a router instance for vision-related API endpoints.
+# ORJSON is the default response class for every route under api/v1.
+router = APIRouter(default_response_class=FastJSONResponse)
 
-def get_service() -> VisionService:
+def get_service(request: Request) -> VisionService:
     """
     Dependency provider for VisionService.
 
-    Initializes VisionService with:
+    Initializes VisionService with the application-wide instances created at startup
+    (see `lifespan` in main.py), so credentials and connection pools are reused:
     - AzureVisionAnalyzer: for image defect analysis
     - FabricRepository: for saving results, using the configured connection string
+    - SingleFlight: for coalescing concurrent inspections of the same image
+    - Shared state store: for the cross-worker result cache
     """
     return VisionService(
-        AzureVisionAnalyzer(),
-        FabricRepository(settings.fabric_connection_string)
+        request.app.state.analyzer,
+        request.app.state.repo,
+        request.app.state.single_flight,
+        shared_state=request.app.state.shared_state,
+        cache_ttl_seconds=settings.result_cache_ttl_seconds
     )
 
 @router.post("/inspect", response_model=DefectResultDTO)
@@ -31,8 +37,22 @@ async def inspect(req: ImageRequestDTO, service: VisionService = Depends(get_ser
     - Uses VisionService to analyze the image and determine defect status.
     - Returns the result as a DefectResultDTO.
 
+    The DTO is built and validated by VisionService, so it is returned as a
+    pre-rendered response instead of being validated again against `response_model`.
+
     :param req: ImageRequestDTO containing the base64 image.
     :param service: VisionService instance provided via dependency injection.
     :return: DefectResultDTO with analysis results.
     """
-    return await service.inspect_image(req)
+    return trusted_response(await service.inspect_image(req))
+
+@router.get("/inspect/stats")
+async def inspect_stats(request: Request):
+    """
+    Endpoint reporting how many /inspect analyses were executed upstream
+    and how many were coalesced into an identical call already in flight.
+
+    :param request: Incoming request, used to reach the application state.
+    :return: Counters of the application's SingleFlight coordinator.
+    """
+    return request.app.state.single_flight.stats()
@@ -0,0 +1,90 @@
+# application/services/single_flight.py
+
+import asyncio
+from functools import partial
+from typing import Any, Callable, Coroutine, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An in-flight call and the number of callers currently waiting on it."""
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    SingleFlight coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work in its own task; callers arriving while it
+    is still running wait on the same task and receive the same result or exception.
+    Nothing is cached: once the call completes, the next caller starts a new one.
+
+    Cancelling one caller does not affect the others. When every caller for a key has
+    been cancelled, the shared work is cancelled too.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call[Any]] = {}
+
+        # Counters exposed through stats()
+        self.executed = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """
+        Runs `fn` for `key`, or joins the call already in flight for it.
+
+        :param key: Identity of the work, e.g. a content hash.
+        :param fn: Coroutine function performing the work; only called by the first caller.
+        :return: Result of the shared call.
+        """
+        call: _Call[T]
+        if key in self._calls:
+            call = self._calls[key]
+            self.coalesced += 1
+        else:
+            call = _Call(asyncio.create_task(fn()))
+            call.task.add_done_callback(partial(self._on_done, key, call))
+            self._calls[key] = call
+            self.executed += 1
+
+        call.waiters += 1
+        try:
+            # shield() so that cancelling this caller leaves the shared task running for the others
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller has gone away; stop the work and let the next caller start afresh
+                self._forget(key, call)
+                call.task.cancel()
+                self.abandoned += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the coordinator's counters.
+
+        - executed: calls that actually ran
+        - coalesced: callers that joined a call already in flight
+        - abandoned: calls cancelled because all their callers were cancelled
+        - in_flight: calls currently running
+        """
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._calls),
+        }
+
+    def _on_done(self, key: str, call: _Call[Any], task: "asyncio.Task[Any]") -> None:
+        self._forget(key, call)
+
+    def _forget(self, key: str, call: _Call[Any]) -> None:
+        # Only remove the entry if it still belongs to this call
+        if self._calls.get(key) is call:
+            del self._calls[key]
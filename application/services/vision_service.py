@@ -1,33 +1,59 @@
 import base64
+import hashlib
+from typing import Optional
 from application.dto.defect_result_dto import DefectResultDTO
 from application.dto.image_request_dto import ImageRequestDTO
 from domain.entities.defect_result import DefectResult
 from domain.contracts.i_fabric_repository import IFabricRepository
 from domain.contracts.i_vision_analyzer import IVisionAnalyzer
+from domain.contracts.i_shared_state_store import ISharedStateStore
+from domain.exceptions import SharedStateError
+from application.services.single_flight import SingleFlight
+from common.logging import get_logger
+
+logger = get_logger(__name__)
 
 class VisionService:
     """
     VisionService handles image inspection by decoding base64 images,
     analyzing them for defects using a vision analyzer, and saving the results
     to a fabric repository. It returns the results in a structured DTO format.
+
+    Concurrent inspections of identical image content share a single analyzer call.
+    When a shared state store is provided, results can be cached across workers.
     """
 
-    def __init__(self, analyzer: IVisionAnalyzer, repo: IFabricRepository):
+    def __init__(
+        self,
+        analyzer: IVisionAnalyzer,
+        repo: IFabricRepository,
+        single_flight: Optional[SingleFlight] = None,
+        shared_state: Optional[ISharedStateStore] = None,
+        cache_ttl_seconds: int = 0,
+    ):
         """
         Initializes the VisionService with dependencies.
 
         :param analyzer: Component responsible for analyzing image data.
         :param repo: Component responsible for persisting defect results.
+        :param single_flight: Coordinator used to coalesce identical in-flight analyses.
+                              Must be shared across services to coalesce across requests.
+        :param shared_state: Store shared by all workers, used for the result cache.
+        :param cache_ttl_seconds: Lifetime of cached results; 0 disables the cache.
         """
         self._analyzer = analyzer
         self._repo = repo
+        self._single_flight = single_flight or SingleFlight()
+        self._shared_state = shared_state
+        self._cache_ttl_seconds = cache_ttl_seconds if shared_state is not None else 0
 
     async def inspect_image(self, req: ImageRequestDTO) -> DefectResultDTO:
         """
         Processes an image inspection request.
 
         - Decodes the base64 image.
-        - Analyzes the image for defects.
+        - Returns a cached result for the same content if one exists.
+        - Otherwise analyzes the image for defects, joining an identical analysis already in flight.
         - Saves the result to the repository.
         - Returns a DTO with the analysis result.
 
@@ -37,9 +63,14 @@ class VisionService:
         # Convert base64 string to raw image bytes
         image_bytes = base64.b64decode(req.image_base64)
 
-        # Analyze the image for defects
+        # Analyze the image for defects; requests for the same content share one upstream call
         await self._analyzer.initialize()
-        defect_result: DefectResult = await self._analyzer.analyze_image(image_bytes)
+        content_hash = hashlib.sha256(image_bytes).hexdigest()
+        defect_result: Optional[DefectResult] = await self._cached_result(content_hash)
+        if defect_result is None:
+            defect_result = await self._single_flight.do(
+                content_hash, lambda: self._analyze(image_bytes, content_hash)
+            )
 
         # Persist the result in the repository
         # await self._repo.save_result(defect_result)
@@ -50,3 +81,39 @@ class VisionService:
             is_defective=defect_result.is_defective,
             probabilities=defect_result.probabilities
         )
+
+    async def _analyze(self, image_bytes: bytes, content_hash: str) -> DefectResult:
+        """
+        Calls the analyzer and caches the result.
+        """
+        defect_result = await self._analyzer.analyze_image(image_bytes)
+
+        if self._shared_state is not None and self._cache_ttl_seconds > 0:
+            try:
+                await self._shared_state.set(
+                    f"result:{content_hash}", defect_result.model_dump_json(), self._cache_ttl_seconds
+                )
+            except SharedStateError as e:
+                logger.error(f"Failed to cache result: {e}")
+        return defect_result
+
+    async def _cached_result(self, content_hash: str) -> Optional[DefectResult]:
+        """
+        Returns the cached result for the content hash, or None on a miss or store failure.
+        Entries that no longer parse (e.g. written by an older version) count as a miss.
+        """
+        if self._shared_state is None or self._cache_ttl_seconds <= 0:
+            return None
+        try:
+            cached = await self._shared_state.get(f"result:{content_hash}")
+        except SharedStateError as e:
+            logger.error(f"Failed to read result cache: {e}")
+            return None
+        if not cached:
+            return None
+        try:
+            return DefectResult.model_validate_json(cached)
+        except ValueError as e:
+            # pydantic's ValidationError is a ValueError
+            logger.warning(f"Ignoring invalid cached result: {e}")
+            return None
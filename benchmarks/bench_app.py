@@ -0,0 +1,42 @@
+# benchmarks/bench_app.py
+
+"""
+The real application from main.py, wired to local stand-ins instead of Azure and Fabric.
+
+Environment variables (set by benchmarks.load_test):
+    STUB_VISION_URL    base URL of benchmarks.stubs.vision_server
+    BENCH_SQLITE_PATH  path of the SQLite database used as repository
+
+The usual application settings (AZURE_KEY_VAULT_NAME, ...) must also be set, since
+common.config is loaded on import.
+
+    python -m uvicorn benchmarks.bench_app:app --port 8000
+"""
+
+import os
+from typing import Optional
+
+# main must be imported first so that its import-time measurement sees a cold interpreter
+from main import create_app
+
+from benchmarks.stubs.key_vault import FakeCredential, FakeKeyVault
+from benchmarks.stubs.sqlite_repository import SqliteRepository
+from common.config import settings
+from infrastructure.azure_vision_analyzer import AzureVisionAnalyzer
+from infrastructure.shared_quota import SharedQuota
+
+key_vault = FakeKeyVault({
+    settings.azure_cognitive_endpoint_url: os.environ["STUB_VISION_URL"],
+    settings.azure_cognitive_api_key: "bench-subscription-key",
+})
+
+
+def build_analyzer(quota: Optional[SharedQuota] = None) -> AzureVisionAnalyzer:
+    return AzureVisionAnalyzer(credential=FakeCredential(), secret_client_factory=key_vault.client, quota=quota)
+
+
+def build_repository() -> SqliteRepository:
+    return SqliteRepository(os.environ["BENCH_SQLITE_PATH"])
+
+
+app = create_app(analyzer_factory=build_analyzer, repository_factory=build_repository)
@@ -0,0 +1,86 @@
+# benchmarks/bench_serialization.py
+
+"""
+Compares the per-response serialization cost of the /inspect route.
+
+- standard: FastAPI's default path — validate the returned DTO against
+  `response_model`, encode it, and render it with the stdlib `json` encoder.
+- fast: the path used by api/v1 — render the trusted DTO with orjson.
+
+Run from the repository root:
+    python -m benchmarks.bench_serialization --iterations 2000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from api.responses import trusted_response
+from application.dto.defect_result_dto import DefectResultDTO
+
+# Number of tags in the probability map for each scenario
+SCENARIOS = {
+    "typical": 12,
+    "large": 5000,
+}
+
+
+def build_dto(tag_count: int) -> DefectResultDTO:
+    """Builds a DefectResultDTO with `tag_count` entries in its probability map."""
+    return DefectResultDTO(
+        image_id=str(uuid.uuid4()),
+        is_defective=True,
+        probabilities={f"tag-{i}": (i % 100) / 100 for i in range(tag_count)},
+        notes="benchmark",
+    )
+
+
+async def standard_path(field, dto: DefectResultDTO) -> bytes:
+    """Mirrors what FastAPI does when a route returns a model with `response_model` set."""
+    content = await serialize_response(field=field, response_content=dto, is_coroutine=True)
+    return JSONResponse(content=content).body
+
+
+async def fast_path(dto: DefectResultDTO) -> bytes:
+    """Mirrors the api/v1 route returning a pre-rendered ORJSON response."""
+    return trusted_response(dto).body
+
+
+async def time_per_call(fn, iterations: int) -> float:
+    """Returns the mean time of `fn()` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def run(iterations: int) -> None:
+    field = create_response_field(name="Response_inspect", type_=DefectResultDTO)
+
+    print(f"{'scenario':<10} {'standard (us)':>14} {'fast (us)':>10} {'speedup':>8} {'bytes':>8}")
+    for name, tag_count in SCENARIOS.items():
+        dto = build_dto(tag_count)
+        # Large maps are slow on the standard path; keep total runtime bounded
+        n = max(10, iterations // max(1, tag_count // 100))
+
+        standard = await time_per_call(lambda: standard_path(field, dto), n)
+        fast = await time_per_call(lambda: fast_path(dto), n)
+        size = len(await fast_path(dto))
+
+        print(f"{name:<10} {standard:>14.1f} {fast:>10.1f} {standard / fast:>7.1f}x {size:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark /inspect response serialization")
+    parser.add_argument("--iterations", type=int, default=2000, help="Iterations for the typical scenario")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/compare.py
+
+"""
+Compares two load test result files written by benchmarks.load_test.
+
+    python -m benchmarks.compare benchmarks/results/<baseline>.json benchmarks/results/<candidate>.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Tuple
+
+# (label, path in "results", True if higher is better)
+METRICS = [
+    ("throughput (rps)", ("throughput_rps",), True),
+    ("latency p50 (ms)", ("latency_ms", "p50"), False),
+    ("latency p90 (ms)", ("latency_ms", "p90"), False),
+    ("latency p99 (ms)", ("latency_ms", "p99"), False),
+    ("latency max (ms)", ("latency_ms", "max"), False),
+    ("dropped", ("dropped",), False),
+    ("rss peak (kB)", ("rss_kb", "peak"), False),
+]
+
+
+def lookup(results: dict, path: Tuple[str, ...]) -> Any:
+    value: Any = results
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two load test results")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+
+    print(f"{'metric':<18} {baseline.get('commit') or 'baseline':>12} {candidate.get('commit') or 'candidate':>12} {'change':>9}")
+    for label, path, higher_is_better in METRICS:
+        old, new = lookup(baseline["results"], path), lookup(candidate["results"], path)
+        if old is None or new is None:
+            print(f"{label:<18} {str(old):>12} {str(new):>12} {'n/a':>9}")
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        marker = " !" if worse and abs(change) >= 5 else ""
+        print(f"{label:<18} {old:>12} {new:>12} {change:>+8.1f}%{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# benchmarks/load_test.py
+
+"""
+Open-loop load test of the real application against local stand-ins.
+
+Starts benchmarks.stubs.vision_server and benchmarks.bench_app (main.py's app with a fake
+Key Vault and a SQLite repository) as separate uvicorn processes, plus
+benchmarks.stubs.state_server when the http shared state backend is selected. Waits for /readyz, then
+sends POST /api/v1/inspect at a fixed arrival rate regardless of how fast responses come
+back. Latency is measured from each request's scheduled send time, so queueing delay is
+not hidden when the service falls behind.
+
+Reports throughput, latency percentiles, status counts, the app's RSS and the load seen by
+the stub vision server, and writes them
+as JSON (tagged with the git commit) for comparison with benchmarks.compare.
+
+Run from the repository root:
+    python -m benchmarks.load_test --rate 200 --duration 30 --vision-latency-ms 80
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def free_port() -> int:
+    """Returns a TCP port that is free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_commit() -> Optional[str]:
+    """Returns the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def rss_kb(pid: int) -> Optional[int]:
+    """Returns the resident set size of a process and its children in kB (Linux only)."""
+    total = 0
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+        except OSError:
+            if current == pid:
+                return None
+            continue
+        try:
+            children = Path(f"/proc/{current}/task/{current}/children").read_text().split()
+        except OSError:
+            children = []
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                total += int(line.split()[1])
+        pids.extend(int(child) for child in children)
+    return total
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    # Multiply before dividing so that exact ranks (e.g. p90 of 10 values) are not lost to rounding
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@contextmanager
+def uvicorn_process(app: str, port: int, env: Dict[str, str], workers: int = 1):
+    """Runs `app` under uvicorn in a child process for the duration of the block."""
+    cmd = [
+        sys.executable, "-m", "uvicorn", app,
+        "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning", "--no-access-log",
+    ]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env={**os.environ, **env})
+    try:
+        yield proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def wait_until_ready(base_url: str, path: str, timeout: float, proc: subprocess.Popen) -> None:
+    """Polls `path` until it answers 200, failing early if the server process exits."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Server for {base_url} exited with code {proc.returncode} before becoming ready")
+            try:
+                if (await client.get(f"{base_url}{path}")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"{base_url}{path} not ready after {timeout:.0f}s")
+
+
+async def sample_rss(pid: int, samples: List[int], interval: float = 0.5) -> None:
+    """Appends the RSS of `pid` to `samples` until cancelled."""
+    while True:
+        value = rss_kb(pid)
+        if value is not None:
+            samples.append(value)
+        await asyncio.sleep(interval)
+
+
+async def open_loop(url: str, bodies: List[bytes], rate: float, duration: float, arrival: str, max_in_flight: int) -> dict:
+    """
+    Sends requests at `rate` per second for `duration` seconds without waiting for responses,
+    cycling through `bodies`.
+
+    Requests that would exceed `max_in_flight` are not sent and are counted as dropped,
+    so an overloaded service shows up as drops and latency rather than a slower send rate.
+    """
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    # Requests admitted by the app's rate limiter, per window (keyed by X-RateLimit-Reset)
+    admitted_per_window: Counter = Counter()
+    in_flight = 0
+    dropped = 0
+
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+
+        async def send(body: bytes, scheduled: float) -> None:
+            nonlocal in_flight
+            try:
+                response = await client.post(url, content=body, headers={"Content-Type": "application/json"})
+                statuses[str(response.status_code)] += 1
+                reset = response.headers.get("X-RateLimit-Reset")
+                if reset is not None and response.status_code != 429:
+                    admitted_per_window[reset] += 1
+                if response.status_code == 200:
+                    latencies.append(loop.time() - scheduled)
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            finally:
+                in_flight -= 1
+
+        tasks: List[asyncio.Task[None]] = []
+        start = loop.time()
+        next_at = start
+        while next_at < start + duration:
+            delay = next_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight >= max_in_flight:
+                dropped += 1
+            else:
+                in_flight += 1
+                tasks.append(asyncio.create_task(send(bodies[len(tasks) % len(bodies)], next_at)))
+            next_at += random.expovariate(rate) if arrival == "poisson" else 1 / rate
+
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+
+    latencies.sort()
+    ok = statuses.get("200", 0)
+    return {
+        "sent": len(tasks),
+        "dropped": dropped,
+        "ok": ok,
+        "statuses": dict(statuses),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(ok / elapsed, 2),
+        "admitted_per_rate_limit_window": dict(sorted(admitted_per_window.items())),
+        "latency_ms": {
+            name: round(value * 1000, 2) if value is not None else None
+            for name, value in {
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+                "max": latencies[-1] if latencies else None,
+            }.items()
+        },
+    }
+
+
+async def run(args) -> dict:
+    vision_port, app_port, state_port = free_port(), free_port(), free_port()
+    base_url = f"http://127.0.0.1:{app_port}"
+    vision_url = f"http://127.0.0.1:{vision_port}"
+
+    # Distinct images, so that requests are only coalesced when the same variant is in flight
+    image = os.urandom(args.image_kb * 1024)
+    bodies = [
+        json.dumps({"image_base64": base64.b64encode(i.to_bytes(8, "big") + image).decode()}).encode()
+        for i in range(args.image_variants)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stub_env = {
+            "STUB_VISION_LATENCY_MS": str(args.vision_latency_ms),
+            "STUB_VISION_JITTER_MS": str(args.vision_jitter_ms),
+            "STUB_VISION_ERROR_RATE": str(args.vision_error_rate),
+            "STUB_VISION_TAG_COUNT": str(args.tag_count),
+        }
+        app_env = {
+            "STUB_VISION_URL": vision_url,
+            "BENCH_SQLITE_PATH": str(Path(tmp) / "bench.db"),
+            "AZURE_KEY_VAULT_NAME": "bench-vault",
+            "AZURE_COGNITIVE_API_KEY": "vision-api-key",
+            "AZURE_COGNITIVE_ENDPOINT_URL": "vision-endpoint-url",
+            "FABRIC_CONNECTION_STRING": "unused",
+            "RATE_LIMIT_MAX_REQUESTS": str(args.rate_limit),
+            "WEB_CONCURRENCY": str(args.workers),
+            "SHARED_STATE_BACKEND": args.shared_state,
+            "SHARED_STATE_SQLITE_PATH": str(Path(tmp) / "shared-state.db"),
+            "SHARED_STATE_URL": f"http://127.0.0.1:{state_port}",
+            **args.extra_env,
+        }
+
+        with ExitStack() as stack:
+            vision_proc = stack.enter_context(
+                uvicorn_process("benchmarks.stubs.vision_server:app", vision_port, stub_env)
+            )
+            if args.shared_state == "http":
+                state_proc = stack.enter_context(
+                    uvicorn_process("benchmarks.stubs.state_server:app", state_port, {})
+                )
+                await wait_until_ready(f"http://127.0.0.1:{state_port}", "/", args.startup_timeout, state_proc)
+            app_proc = stack.enter_context(
+                uvicorn_process("benchmarks.bench_app:app", app_port, app_env, workers=args.workers)
+            )
+            await wait_until_ready(vision_url, "/", args.startup_timeout, vision_proc)
+            await wait_until_ready(base_url, "/readyz", args.startup_timeout, app_proc)
+
+            rss_idle = rss_kb(app_proc.pid)
+            rss_samples: List[int] = []
+            sampler = asyncio.create_task(sample_rss(app_proc.pid, rss_samples))
+            try:
+                results = await open_loop(
+                    f"{base_url}/api/v1/inspect", bodies, args.rate, args.duration, args.arrival, args.max_in_flight
+                )
+            finally:
+                sampler.cancel()
+
+            async with httpx.AsyncClient() as client:
+                results["upstream"] = (await client.get(f"{vision_url}/stats")).json()
+
+    results["rss_kb"] = {
+        "idle": rss_idle,
+        "peak": max(rss_samples) if rss_samples else None,
+        "final": rss_samples[-1] if rss_samples else None,
+    }
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load test of /api/v1/inspect")
+    parser.add_argument("--rate", type=float, default=100, help="Request arrival rate per second")
+    parser.add_argument("--duration", type=float, default=20, help="Test duration in seconds")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Client-side cap on concurrent requests")
+    parser.add_argument("--image-kb", type=int, default=64, help="Size of the uploaded image")
+    parser.add_argument("--image-variants", type=int, default=64, help="Number of distinct images sent round-robin")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument(
+        "--shared-state", choices=["memory", "sqlite", "http"], default="memory",
+        help="Shared state backend of the app (http starts benchmarks.stubs.state_server)",
+    )
+    parser.add_argument("--rate-limit", type=int, default=10**9, help="Per-client rate limit of the app")
+    parser.add_argument("--vision-latency-ms", type=float, default=50)
+    parser.add_argument("--vision-jitter-ms", type=float, default=10)
+    parser.add_argument("--vision-error-rate", type=float, default=0.0)
+    parser.add_argument("--tag-count", type=int, default=12, help="Tags returned by the stub vision server")
+    parser.add_argument("--startup-timeout", type=float, default=30)
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument(
+        "--env", dest="extra_env", action="append", default=[], metavar="KEY=VALUE",
+        help="Extra environment variable for the app process (repeatable)",
+    )
+    args = parser.parse_args(argv)
+    args.extra_env = dict(item.split("=", 1) for item in args.extra_env)
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    commit = git_commit()
+    started = datetime.now(timezone.utc)
+    results = asyncio.run(run(args))
+
+    report = {
+        "commit": commit,
+        "timestamp": started.isoformat(timespec="seconds"),
+        "config": {key: (str(value) if isinstance(value, Path) else value) for key, value in vars(args).items()},
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / f"{started:%Y%m%dT%H%M%S}-{commit or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(json.dumps(results, indent=2))
+    print(f"Saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/multi_worker_limits.py
+
+"""
+Checks that global limits hold when the app runs with several uvicorn workers.
+
+Runs benchmarks.load_test with N workers sharing state through the sqlite or http backend,
+offering more load than the limits allow, and verifies that:
+
+- the rate limiter was actually hit (some requests got 429), and no rate-limit window
+  admitted more than rate_limit requests service-wide. Windows are identified by the
+  X-RateLimit-Reset header of each response, i.e. by when the app admitted the request,
+  not by when the load generator sent it;
+- concurrent calls seen by the stub vision server never exceed azure_max_concurrency;
+- calls per second seen by the stub vision server never exceed azure_max_requests_per_second
+  (plus azure_max_concurrency, for calls granted a token just before a second boundary
+  that reach the stub just after it).
+
+Exits non-zero if a limit was exceeded or the rate limiter was never hit. Run from the repository root:
+    python -m benchmarks.multi_worker_limits --workers 4 --shared-state sqlite
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from benchmarks import load_test
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verify global limits with multiple workers")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--shared-state", choices=["sqlite", "http"], default="sqlite")
+    # Defaults offer several times the rate limit and admit more than the Azure budget,
+    # so every limit is exercised even on a small host
+    parser.add_argument("--rate", type=float, default=100, help="Offered requests per second")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--rate-limit", type=int, default=50, help="Requests allowed per window, service-wide")
+    parser.add_argument("--window-seconds", type=int, default=5)
+    parser.add_argument("--azure-max-concurrency", type=int, default=4)
+    parser.add_argument("--azure-max-rps", type=int, default=8)
+    parser.add_argument("--vision-latency-ms", type=float, default=200)
+    parser.add_argument("--output", type=Path, help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    load_args = load_test.parse_args([
+        "--workers", str(args.workers),
+        "--shared-state", args.shared_state,
+        "--rate", str(args.rate),
+        "--duration", str(args.duration),
+        "--rate-limit", str(args.rate_limit),
+        "--vision-latency-ms", str(args.vision_latency_ms),
+        "--env", f"RATE_LIMIT_WINDOW_SECONDS={args.window_seconds}",
+        "--env", f"AZURE_MAX_CONCURRENCY={args.azure_max_concurrency}",
+        "--env", f"AZURE_MAX_REQUESTS_PER_SECOND={args.azure_max_rps}",
+    ])
+    results = asyncio.run(load_test.run(load_args))
+
+    admitted = results["admitted_per_rate_limit_window"]
+    rejected = results["statuses"].get("429", 0)
+    upstream = results["upstream"]
+
+    # name -> (observed, limit, ok)
+    checks = {
+        "rate_limit_hit": (rejected, "> 0", rejected > 0),
+        "rate_limit_per_window": (
+            max(admitted.values(), default=0), args.rate_limit,
+            bool(admitted) and max(admitted.values()) <= args.rate_limit,
+        ),
+        "azure_concurrency": (
+            upstream["max_in_flight"], args.azure_max_concurrency,
+            upstream["max_in_flight"] <= args.azure_max_concurrency,
+        ),
+        "azure_requests_per_second": (
+            upstream["max_per_second"], args.azure_max_rps + args.azure_max_concurrency,
+            upstream["max_per_second"] <= args.azure_max_rps + args.azure_max_concurrency,
+        ),
+    }
+    report = {
+        "config": vars(args) | {"output": str(args.output) if args.output else None},
+        "results": results,
+        "checks": {name: {"observed": observed, "limit": limit, "ok": ok}
+                   for name, (observed, limit, ok) in checks.items()},
+    }
+
+    for name, check in report["checks"].items():
+        print(f"{name:<26} observed={check['observed']:<6} limit={check['limit']:<6} {'PASS' if check['ok'] else 'FAIL'}")
+    print(f"admitted per rate-limit window: {admitted}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+    sys.exit(0 if all(check["ok"] for check in report["checks"].values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/stubs/key_vault.py
+
+"""
+In-memory stand-ins for the Azure credential and Key Vault secret client.
+
+`FakeKeyVault.client` has the same signature as `SecretClient`, so it can be passed to
+AzureVisionAnalyzer as `secret_client_factory`.
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Dict
+
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ResourceNotFoundError
+
+
+class FakeCredential:
+    """Async credential that hands out a static token."""
+
+    async def get_token(self, *scopes, **kwargs) -> AccessToken:
+        return AccessToken("bench-token", int(time.time()) + 3600)
+
+    async def close(self) -> None:
+        return None
+
+
+class FakeSecretClient:
+    """Async Key Vault client backed by a dictionary."""
+
+    def __init__(self, secrets: Dict[str, str]):
+        self._secrets = secrets
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def get_secret(self, name: str):
+        if name not in self._secrets:
+            raise ResourceNotFoundError(f"Secret {name} not found")
+        return SimpleNamespace(name=name, value=self._secrets[name])
+
+
+class FakeKeyVault:
+    """Holds the secrets served to every FakeSecretClient it creates."""
+
+    def __init__(self, secrets: Dict[str, str]):
+        self.secrets = dict(secrets)
+
+    def client(self, vault_url: str, credential) -> FakeSecretClient:
+        return FakeSecretClient(self.secrets)
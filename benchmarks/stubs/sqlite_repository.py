@@ -0,0 +1,70 @@
+# benchmarks/stubs/sqlite_repository.py
+
+"""
+SQLite-backed stand-in for FabricRepository.
+
+Writes to a table with the same columns as bronze.defect_results. VisionService does not
+call save_result yet (persistence is commented out), so for now the repository is only
+exercised by the startup warm-up; once persistence is enabled, its cost becomes part of
+the measurement without needing a Fabric SQL endpoint.
+"""
+
+import asyncio
+import json
+import sqlite3
+
+from domain.contracts.i_fabric_repository import IFabricRepository
+from domain.entities.defect_result import DefectResult
+from domain.exceptions import FabricRepositoryError
+
+
+class SqliteRepository(IFabricRepository):
+    """Persists DefectResult rows to a local SQLite database."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def warm_up(self) -> None:
+        """Creates the results table; mirrors FabricRepository.warm_up."""
+        try:
+            await asyncio.to_thread(self._create_table)
+        except Exception as e:
+            raise FabricRepositoryError(str(e))
+
+    async def save_result(self, result: DefectResult) -> None:
+        try:
+            await asyncio.to_thread(self._insert, result)
+        except Exception as e:
+            raise FabricRepositoryError(str(e))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _create_table(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS defect_results (
+                    image_id TEXT, timestamp TEXT, is_defective INTEGER,
+                    probabilities TEXT, raw_response TEXT
+                )
+                """
+            )
+
+    def _insert(self, result: DefectResult) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO defect_results VALUES (?, ?, ?, ?, ?)",
+                    (
+                        result.image_id,
+                        result.timestamp.isoformat(),
+                        int(result.is_defective),
+                        json.dumps(result.probabilities),
+                        json.dumps(result.raw_response),
+                    ),
+                )
+        finally:
+            conn.close()
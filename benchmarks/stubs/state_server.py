@@ -0,0 +1,47 @@
+# benchmarks/stubs/state_server.py
+
+"""
+Local stand-in for the network shared state store.
+
+Serves the protocol of infrastructure.shared_state.HttpSharedStateStore from an
+in-memory store. Run it as a single process so every client sees the same state:
+
+    python -m uvicorn benchmarks.stubs.state_server:app --port 9200
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from infrastructure.shared_state import InMemorySharedStateStore
+
+store = InMemorySharedStateStore()
+
+
+async def incr(request: Request):
+    body = await request.json()
+    return JSONResponse({"value": await store.incr(body["key"], body["ttl_seconds"])})
+
+
+async def get_value(request: Request):
+    body = await request.json()
+    return JSONResponse({"value": await store.get(body["key"])})
+
+
+async def set_value(request: Request):
+    body = await request.json()
+    await store.set(body["key"], body["value"], body["ttl_seconds"])
+    return JSONResponse({})
+
+
+async def root(request: Request):
+    return JSONResponse({"status": "ok"})
+
+
+app = Starlette(routes=[
+    Route("/incr", incr, methods=["POST"]),
+    Route("/get", get_value, methods=["POST"]),
+    Route("/set", set_value, methods=["POST"]),
+    Route("/", root, methods=["GET"]),
+])
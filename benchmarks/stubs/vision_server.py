@@ -0,0 +1,95 @@
+# benchmarks/stubs/vision_server.py
+
+"""
+Local stand-in for the Azure Computer Vision image analysis endpoint.
+
+Serves `POST /computervision/imageanalysis:analyze` with a canned tags payload after a
+configurable delay, and fails a configurable fraction of calls. `GET /stats` reports the
+number of calls received, the peak number of calls in flight at once and the peak
+number of calls started within one second. Configured through
+environment variables so it can be started by uvicorn in its own process:
+
+    STUB_VISION_LATENCY_MS  mean response delay in milliseconds (default 50)
+    STUB_VISION_JITTER_MS   standard deviation of the delay (default 10)
+    STUB_VISION_ERROR_RATE  fraction of calls answered with 503 (default 0.0)
+    STUB_VISION_TAG_COUNT   number of tags in each response (default 12)
+
+    python -m uvicorn benchmarks.stubs.vision_server:app --port 9100
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import Counter
+from typing import Dict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+LATENCY_MS = float(os.getenv("STUB_VISION_LATENCY_MS", "50"))
+JITTER_MS = float(os.getenv("STUB_VISION_JITTER_MS", "10"))
+ERROR_RATE = float(os.getenv("STUB_VISION_ERROR_RATE", "0.0"))
+TAG_COUNT = int(os.getenv("STUB_VISION_TAG_COUNT", "12"))
+
+TAG_NAMES = ["metal", "surface", "scratch", "steel", "rust", "close-up", "dent", "industrial"]
+
+
+def build_payload(tag_count: int) -> dict:
+    """Builds a response shaped like the Image Analysis 2024-02-01 API."""
+    values = [
+        {"name": f"{TAG_NAMES[i % len(TAG_NAMES)]}-{i}", "confidence": round(1 - i / (tag_count + 1), 4)}
+        for i in range(tag_count)
+    ]
+    return {
+        "modelVersion": "2023-10-01",
+        "metadata": {"width": 640, "height": 480},
+        "tagsResult": {"values": values},
+        "objectsResult": {"values": []},
+    }
+
+
+PAYLOAD = build_payload(TAG_COUNT)
+
+# Observed load, reported by /stats
+stats: Dict[str, int] = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "max_per_second": 0}
+per_second: Counter[int] = Counter()
+
+
+async def analyze(request: Request):
+    if not request.headers.get("Ocp-Apim-Subscription-Key"):
+        return JSONResponse({"error": {"code": "401", "message": "Missing subscription key"}}, status_code=401)
+
+    stats["requests"] += 1
+    stats["in_flight"] += 1
+    stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+    second = int(time.time())
+    per_second[second] += 1
+    stats["max_per_second"] = max(stats["max_per_second"], per_second[second])
+    try:
+        await request.body()
+        await asyncio.sleep(max(0.0, random.gauss(LATENCY_MS, JITTER_MS)) / 1000)
+    finally:
+        stats["in_flight"] -= 1
+
+    if random.random() < ERROR_RATE:
+        return JSONResponse({"error": {"code": "ServiceUnavailable", "message": "Injected failure"}}, status_code=503)
+    return JSONResponse(PAYLOAD)
+
+
+async def root(request: Request):
+    # Target of the analyzer's connection warm-up
+    return Response(status_code=200)
+
+
+async def get_stats(request: Request):
+    return JSONResponse(stats)
+
+
+app = Starlette(routes=[
+    Route("/stats", get_stats, methods=["GET"]),
+    Route("/computervision/imageanalysis:analyze", analyze, methods=["POST"]),
+    Route("/", root, methods=["GET", "HEAD"]),
+])
@@ -11,6 +11,21 @@ class Settings(BaseSettings):
         azure_key_vault_name (str): Name of the Azure Key Vault.
         azure_cognitive_api_key (str): Secret name or value for the Azure Cognitive Services API key.
         azure_cognitive_endpoint_url (str): Secret name or value for the Azure Cognitive Services endpoint URL.
+        fabric_connection_string (str): ODBC connection string for the Fabric SQL database.
+        vision_http_timeout_seconds (float): Timeout for calls to the vision endpoint.
+        vision_http_keepalive_seconds (float): How long idle connections to the vision endpoint are kept open.
+        azure_max_concurrency (int): Concurrent Azure Vision calls allowed across all workers and replicas.
+        azure_max_requests_per_second (int): Azure Vision calls per second allowed service-wide (0 disables the quota).
+        web_concurrency (int): Worker processes per replica; uvicorn also reads WEB_CONCURRENCY as its --workers default.
+        replica_count (int): Number of replicas sharing the Azure budget.
+        shared_state_backend (str): "memory" (single worker), "sqlite" (one host) or "http" (network store).
+        shared_state_sqlite_path (str): Database path for the sqlite backend; defaults to /dev/shm when available.
+        shared_state_url (str): Base URL of the network store for the http backend.
+        result_cache_ttl_seconds (int): Lifetime of cached analysis results (0 disables the cache).
+        rate_limit_max_requests (int): Requests allowed per client IP within the rate-limit window, across all workers.
+        rate_limit_window_seconds (int): Length of the rate-limit window.
+        warmup_attempt_timeout_seconds (float): Timeout for a single startup warm-up attempt.
+        warmup_max_backoff_seconds (float): Upper bound for the delay between warm-up retries.
     """
 
     # Application name
@@ -22,6 +37,38 @@ class Settings(BaseSettings):
     azure_cognitive_endpoint_url: str
     fabric_connection_string: str
 
+    # Shared HTTP pool for the Azure Vision endpoint
+    vision_http_timeout_seconds: float = 30.0
+    vision_http_keepalive_seconds: float = 120.0
+
+    # Service-wide Azure Vision budget, split across every worker of every replica
+    azure_max_concurrency: int = 32
+    azure_max_requests_per_second: int = 0
+    web_concurrency: int = 1
+    replica_count: int = 1
+
+    # State shared by all workers: rate-limit counters, result cache and quota tokens
+    shared_state_backend: str = "memory"
+    shared_state_sqlite_path: str = ""
+    shared_state_url: str = ""
+    result_cache_ttl_seconds: int = 0
+
+    # Per-client rate limiting
+    rate_limit_max_requests: int = 5
+    rate_limit_window_seconds: int = 30
+
+    # Startup warm-up of external dependencies
+    warmup_attempt_timeout_seconds: float = 15.0
+    warmup_max_backoff_seconds: float = 30.0
+
+    @property
+    def azure_worker_concurrency(self) -> int:
+        """
+        Share of azure_max_concurrency available to one worker process.
+        The application refuses to start when this would be zero.
+        """
+        return self.azure_max_concurrency // max(1, self.web_concurrency * self.replica_count)
+
     class Config:
         # Specify the name of the environment file and encoding to load variables from
         env_file = ".env"
@@ -11,6 +11,10 @@ This module provides:
 
 import logging
 import uuid
+from contextvars import ContextVar
+
+# Correlation ID of the request being handled by the current task
+_current_id: ContextVar[str] = ContextVar("correlation_id", default="N/A")
 
 def get_logger(name: str):
     """
@@ -41,8 +45,10 @@ class CorrelationIdContext:
     """
     Manages the current correlation ID for logging context.
     Useful for tracing logs across asynchronous operations.
+
+    The ID is held in a context variable, so concurrent requests in the same
+    worker each see their own ID.
     """
-    current_id = "N/A"
 
     @staticmethod
     def new_id() -> str:
@@ -52,8 +58,25 @@ class CorrelationIdContext:
         Returns:
             str: The newly generated correlation ID.
         """
-        CorrelationIdContext.current_id = str(uuid.uuid4())
-        return CorrelationIdContext.current_id
+        return CorrelationIdContext.set(str(uuid.uuid4()))
+
+    @staticmethod
+    def set(correlation_id: str) -> str:
+        """
+        Sets the current correlation ID, e.g. one received from an upstream service.
+
+        Returns:
+            str: The correlation ID.
+        """
+        _current_id.set(correlation_id)
+        return correlation_id
+
+    @staticmethod
+    def get() -> str:
+        """
+        Returns the current correlation ID, or "N/A" outside a request.
+        """
+        return _current_id.get()
 
 class CorrelationIdFilter(logging.Filter):
     """
@@ -70,5 +93,5 @@ class CorrelationIdFilter(logging.Filter):
         Returns:
             bool: Always True to allow the log record to be processed.
         """
-        record.cid = getattr(CorrelationIdContext, "current_id", "N/A")
+        record.cid = CorrelationIdContext.get()
         return True
@@ -0,0 +1,108 @@
+# common/startup.py
+
+"""
+Readiness tracking for the startup warm-up.
+
+This module provides:
+- `DependencyState`: the warm-up state of a single dependency.
+- `ReadinessRegistry`: runs warm-up steps with retries and reports their state
+  to the readiness probe.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DependencyState(BaseModel):
+    """
+    Warm-up state of a single dependency, as reported by the readiness probe.
+
+    Attributes:
+        status (str): One of "pending", "ready" or "failed".
+        attempts (int): Number of warm-up attempts made so far.
+        duration_ms (Optional[float]): Duration of the last attempt in milliseconds.
+        error (Optional[str]): Error message of the last failed attempt.
+        required (bool): Whether readiness waits for this dependency.
+    """
+
+    status: str = "pending"
+    attempts: int = 0
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    required: bool = True
+
+
+class ReadinessRegistry:
+    """
+    Tracks the warm-up state of each named dependency.
+
+    The service is ready once every required dependency has warmed up successfully.
+    Optional dependencies are warmed up and reported, but do not affect readiness.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        attempt_timeout: float,
+        max_backoff: float,
+        optional: Iterable[str] = (),
+    ):
+        """
+        Args:
+            names (Iterable[str]): Dependencies that must be ready before traffic is accepted.
+            attempt_timeout (float): Timeout in seconds for a single warm-up attempt.
+            max_backoff (float): Upper bound in seconds for the delay between retries.
+            optional (Iterable[str]): Dependencies that are reported but not required for readiness.
+        """
+        self._states: Dict[str, DependencyState] = {name: DependencyState() for name in names}
+        self._states.update({name: DependencyState(required=False) for name in optional})
+        self._attempt_timeout = attempt_timeout
+        self._max_backoff = max_backoff
+
+    @property
+    def is_ready(self) -> bool:
+        """True when every required dependency is ready."""
+        return all(state.status == "ready" for state in self._states.values() if state.required)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Returns the state of every dependency as plain dictionaries."""
+        return {name: state.model_dump() for name, state in self._states.items()}
+
+    async def run(self, name: str, step: Callable[[], Awaitable[None]]) -> None:
+        """
+        Runs a warm-up step until it succeeds, backing off exponentially between attempts.
+
+        Args:
+            name (str): Registered dependency name.
+            step (Callable[[], Awaitable[None]]): Coroutine function that warms the dependency.
+        """
+        state = self._states[name]
+        delay = min(1.0, self._max_backoff)
+        while True:
+            state.attempts += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(step(), timeout=self._attempt_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.status = "failed"
+                state.error = str(e) or type(e).__name__
+                state.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+                logger.warning(f"Warm-up of {name} failed (attempt {state.attempts}): {state.error}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._max_backoff)
+                continue
+
+            state.status = "ready"
+            state.error = None
+            state.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            logger.info(f"Warm-up of {name} completed in {state.duration_ms:.2f} ms")
+            return
@@ -0,0 +1,59 @@
+# domain/contracts/i_shared_state_store.py
+
+# Importing Abstract Base Class (ABC) and abstractmethod to define an interface-like class
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class ISharedStateStore(ABC):
+    """
+    ISharedStateStore is an abstract base class (interface) that defines the contract
+    for state shared by every worker process and replica of the service:
+    rate-limit counters, cached results and upstream quota tokens.
+
+    Every key carries a time-to-live; expired keys behave as if they were absent.
+    """
+
+    @abstractmethod
+    async def incr(self, key: str, ttl_seconds: float) -> int:
+        """
+        Atomically increment the counter stored at `key` and return its new value.
+
+        Args:
+            key (str): Counter name.
+            ttl_seconds (float): Lifetime of the counter, applied when it is created
+                                 (i.e. when the key is absent or has expired).
+
+        Returns:
+            int: The counter value after the increment (1 for a new counter).
+
+        Raises:
+            SharedStateError: If the store cannot be reached or updated.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Return the value stored at `key`, or None if it is absent or expired.
+
+        Raises:
+            SharedStateError: If the store cannot be reached.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """
+        Store `value` at `key` for `ttl_seconds`, replacing any previous value.
+
+        Raises:
+            SharedStateError: If the store cannot be reached or updated.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release connections held by the store. The default implementation does nothing.
+        """
+        return None
@@ -16,6 +16,15 @@ class IVisionAnalyzer(ABC):
     to analyze an image and return a DefectResult.
     """
 
+    async def initialize(self) -> None:
+        """
+        Prepare the analyzer for use (e.g. load credentials or secrets).
+
+        Called before every analysis, so implementations must make repeated calls cheap.
+        The default implementation does nothing.
+        """
+        return None
+
     @abstractmethod
     async def analyze_image(self, image_byte: bytes) -> DefectResult:
         """
@@ -4,4 +4,7 @@ class VisionAnalysisError(Exception):
     """Thrown when Azure Vision analysis failed"""
 
 class FabricRepositoryError(Exception):
-    """Thrown when Microsoft Fabric pipeline ingestion failed"""
\ No newline at end of file
+    """Thrown when Microsoft Fabric pipeline ingestion failed"""
+
+class SharedStateError(Exception):
+    """Thrown when the shared state store cannot be read or updated"""
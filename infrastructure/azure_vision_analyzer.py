@@ -1,12 +1,13 @@
 # infrastructure/azure_vision_analyzer.py
 
-import aiohttp, base64, httpx, uuid
+import aiohttp, asyncio, base64, httpx, uuid
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 
 from domain.contracts.i_vision_analyzer import IVisionAnalyzer
 from domain.entities.defect_result import DefectResult
 from domain.exceptions import VisionAnalysisError
+from infrastructure.shared_quota import SharedQuota
 
 from common.config import settings
 from common.logging import get_logger
@@ -16,15 +17,30 @@ from azure.keyvault.secrets.aio import SecretClient
 
 logger = get_logger(__name__)
 
+# Token scope requested when pre-establishing the Key Vault credential
+KEY_VAULT_SCOPE = "https://vault.azure.net/.default"
+
 class AzureVisionAnalyzer(IVisionAnalyzer):
     """
     AzureVisionAnalyzer uses Azure Cognitive Services to analyze images
     and detect defects based on tags returned by the Computer Vision API.
+
+    One instance is shared by the application: the credential, the secrets and the
+    HTTP connection pool are established once and reused by every request.
+    Concurrent calls are capped at this worker's share of the Azure budget
+    (settings.azure_worker_concurrency), and each call takes a slot from the
+    service-wide calls-per-second quota when one is given.
     """
 
-    def __init__(self):
+    def __init__(self, credential=None, secret_client_factory=SecretClient, quota: Optional[SharedQuota] = None):
         """
         Initializes configuration values and placeholders for endpoint, key, and headers.
+
+        Args:
+            credential: Async Azure credential. Defaults to DefaultAzureCredential, created on first use.
+            secret_client_factory: Callable taking `vault_url` and `credential` and returning an
+                                   async Key Vault client. Defaults to SecretClient.
+            quota (Optional[SharedQuota]): Service-wide calls-per-second budget for the vision endpoint.
         """
         # Key Vault and Cognitive Services configuration
         self.key_vault_url = f"https://{settings.azure_key_vault_name}.vault.azure.net/"
@@ -32,41 +48,130 @@ class AzureVisionAnalyzer(IVisionAnalyzer):
         self.azure_cognitive_endpoint_url = settings.azure_cognitive_endpoint_url
 
         # Placeholders for runtime values
-        self.endpoint = None
-        self.key = None
-        self.url = None
-        self.headers = None
+        self.endpoint: Optional[str] = None
+        self.key: Optional[str] = None
+        self.url: Optional[str] = None
+        self.headers: Optional[Dict[str, str]] = None
+
+        # Long-lived resources, created on first use or during startup warm-up
+        self._credential = credential
+        self._secret_client_factory = secret_client_factory
+        self._client: Optional[httpx.AsyncClient] = None
+        self._init_lock = asyncio.Lock()
+
+        # This worker's share of the service-wide Azure concurrency budget
+        self.max_concurrency = settings.azure_worker_concurrency
+        self._concurrency = asyncio.Semaphore(self.max_concurrency)
+        self._quota = quota
+
+    async def acquire_credential(self):
+        """
+        Creates the Azure credential and acquires a Key Vault token so that
+        later secret lookups do not pay for authentication.
+        """
+        if self._credential is None:
+            self._credential = DefaultAzureCredential()
+        await self._credential.get_token(KEY_VAULT_SCOPE)
+
+    async def load_secrets(self, rejected_key: Optional[str] = None):
+        """
+        Retrieves secrets from Azure Key Vault and sets up the endpoint URL and
+        headers for the Computer Vision API. Does nothing if they are already loaded.
+
+        Args:
+            rejected_key (Optional[str]): Subscription key the endpoint has rejected. If it is
+                                          still the loaded key, the secrets are fetched again.
+        """
+        async with self._init_lock:
+            # Concurrent callers rejected with the same key reload it only once
+            if self.url and self.key != rejected_key:
+                return
+
+            if self._credential is None:
+                self._credential = DefaultAzureCredential()
+
+            async with self._secret_client_factory(vault_url=self.key_vault_url, credential=self._credential) as client:
+                # Retrieve secrets from Key Vault
+                endpoint_secret = await client.get_secret(self.azure_cognitive_endpoint_url)
+                key_secret = await client.get_secret(self.azure_cognitive_api_key)
+
+                if not endpoint_secret.value or not key_secret.value:
+                    raise ValueError("Key Vault returned an empty vision endpoint or key")
+
+                # Set endpoint and key
+                self.endpoint = endpoint_secret.value
+                self.key = key_secret.value
+
+                # Construct full API URL and headers
+                self.url = f"{self.endpoint.rstrip('/')}/computervision/imageanalysis:analyze?api-version=2024-02-01"
+                self.headers = {
+                    "Ocp-Apim-Subscription-Key": self.key,
+                    "Content-Type": "application/octet-stream",
+                }
+
+    async def open_http_pool(self):
+        """
+        Creates the shared HTTP client and opens a connection to the vision endpoint,
+        paying for DNS resolution and the TLS handshake before the first request.
+        Any HTTP status counts as success; only transport errors are raised.
+        """
+        await self.load_secrets()
+        await self._http_client().head(self.endpoint)
 
-        #print(self.key_vault_url)
-        #print(self.azure_cognitive_api_key)
-        #print(self.azure_cognitive_endpoint_url)
-    async def initialize(self): 
+    async def initialize(self):
         """
-        Asynchronously retrieves secrets from Azure Key Vault and sets up
-        the endpoint URL and headers for the Computer Vision API.
+        Ensures the secrets needed by analyze_image are loaded.
+        Cheap after the first successful call (or after startup warm-up).
         """
+        if self.url:
+            return
+
         try:
-            async with DefaultAzureCredential() as credential:
-                async with SecretClient(vault_url=self.key_vault_url, credential=credential) as client:
-                    # Retrieve secrets from Key Vault
-                    endpoint_secret = await client.get_secret(self.azure_cognitive_endpoint_url)
-                    key_secret = await client.get_secret(self.azure_cognitive_api_key)
-
-                    # Set endpoint and key
-                    self.endpoint = endpoint_secret.value
-                    self.key = key_secret.value
-
-                    # Construct full API URL and headers
-                    self.url = f"{self.endpoint.rstrip('/')}/computervision/imageanalysis:analyze?api-version=2024-02-01"
-                    self.headers = {
-                        "Ocp-Apim-Subscription-Key": self.key,
-                        "Content-Type": "application/octet-stream",
-                    }
-                    
+            await self.load_secrets()
         except Exception as e:
             logger.error(f"Failed to retrieve Key Vault secrets: {e}")
             raise VisionAnalysisError(str(e))
 
+    async def close(self):
+        """
+        Releases the HTTP connection pool and the credential.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._credential is not None:
+            await self._credential.close()
+            self._credential = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """
+        Returns the shared HTTP client, creating it on first use.
+        Idle connections are kept for vision_http_keepalive_seconds, so the connection
+        opened during warm-up is still there for the first request.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.vision_http_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    keepalive_expiry=settings.vision_http_keepalive_seconds,
+                ),
+            )
+        return self._client
+
+    async def _post(self, url: str, headers: Dict[str, str], image_byte: bytes) -> httpx.Response:
+        """
+        Takes a quota slot, when a quota is given, and posts the image to the vision endpoint.
+        """
+        if self._quota is not None:
+            await self._quota.acquire()
+        return await self._http_client().post(
+            url,
+            headers=headers,
+            params={"features": "objects,tags"},
+            content=image_byte
+        )
+
     async def analyze_image(self, image_byte: bytes) -> DefectResult:
         """
         Sends an image to Azure Computer Vision API for analysis and returns
@@ -83,17 +188,18 @@ class AzureVisionAnalyzer(IVisionAnalyzer):
             raise VisionAnalysisError("Azure Vision analysis client not initialized")
 
         try:
-            # Send image to Azure Vision API
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.url,
-                    headers=self.headers,
-                    params={"features": "objects,tags"},
-                    content=image_byte
-                )
-                response.raise_for_status()
-                payload: Dict = response.json()
-                #print(payload)
+            # Send image to Azure Vision API over the shared connection pool,
+            # waiting for a slot in this worker's concurrency budget. The quota slot is
+            # taken inside it, so calls queued behind the semaphore cannot burst past the quota.
+            async with self._concurrency:
+                response = await self._post(self.url, self.headers, image_byte)
+                # The key may have been rotated in Key Vault: reload the secrets and retry once
+                if response.status_code in (401, 403):
+                    logger.warning(f"Azure Vision rejected the subscription key ({response.status_code}); reloading secrets")
+                    await self.load_secrets(rejected_key=self.key)
+                    response = await self._post(self.url, self.headers, image_byte)
+            response.raise_for_status()
+            payload: Dict = response.json()
         except Exception as e:
             logger.exception("Azure Vision analysis failed")
             raise VisionAnalysisError(str(e))
@@ -1,5 +1,6 @@
 # infrastructure/fabric_repository.py
 
+import asyncio
 import json
 import pyodbc
 
@@ -28,6 +29,31 @@ class FabricRepository(IFabricRepository):
         """
         self.conn_str = connection_str
 
+    async def warm_up(self) -> None:
+        """
+        Loads the ODBC driver and opens a pooled connection to the database,
+        so the first save does not pay for driver load and login.
+
+        Raises:
+            FabricRepositoryError: If the database cannot be reached.
+        """
+        try:
+            await asyncio.to_thread(self._ping)
+        except Exception as e:
+            logger.error(f"Fabric warm-up failed: {e}")
+            raise FabricRepositoryError(str(e))
+
+    def _ping(self) -> None:
+        """
+        Runs a trivial query and closes the connection, returning it to the
+        ODBC driver manager pool (pyodbc enables pooling by default).
+        """
+        conn = pyodbc.connect(self.conn_str)
+        try:
+            conn.cursor().execute("SELECT 1").fetchone()
+        finally:
+            conn.close()
+
     async def save_result(self, result: DefectResult) -> None:
         """
         Saves a DefectResult object into the bronze.defect_results table.
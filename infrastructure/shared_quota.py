@@ -0,0 +1,61 @@
+# infrastructure/shared_quota.py
+
+import asyncio
+import time
+
+from domain.contracts.i_shared_state_store import ISharedStateStore
+from domain.exceptions import SharedStateError
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SharedQuota:
+    """
+    SharedQuota enforces a service-wide calls-per-second budget through the shared state store.
+
+    Each caller reserves a slot by incrementing the counter of a one-second window and
+    then sleeps until that window starts. A call only proceeds in a window whose counter
+    it incremented to at most the limit, so the budget holds across every worker and replica.
+    If the store is unreachable the quota fails open so that inspections keep flowing.
+    """
+
+    def __init__(self, store: ISharedStateStore, name: str, limit_per_second: int):
+        """
+        Args:
+            store (ISharedStateStore): Shared state store holding the slot counters.
+            name (str): Name of the quota, used in the counter keys.
+            limit_per_second (int): Slots per second; 0 or less disables the quota.
+        """
+        self._store = store
+        self._name = name
+        self._limit = limit_per_second
+
+    async def acquire(self) -> None:
+        """
+        Reserves a slot and waits until the window it belongs to has started.
+
+        A full window reports how far the backlog reaches (position n in window w means
+        window w + (n - 1) // limit), so the caller jumps straight to that window and
+        reserves there. This costs one store write per jump rather than one per caller
+        per second, and there is no polling while waiting.
+        """
+        if self._limit <= 0:
+            return
+
+        window = int(time.time())
+        while True:
+            try:
+                position = await self._store.incr(
+                    f"quota:{self._name}:{window}", ttl_seconds=window + 2 - time.time()
+                )
+            except SharedStateError as e:
+                logger.error(f"Quota {self._name} unavailable, allowing call: {e}")
+                return
+            if position <= self._limit:
+                break
+            window += (position - 1) // self._limit
+
+        delay = window - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,237 @@
+# infrastructure/shared_state.py
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from domain.contracts.i_shared_state_store import ISharedStateStore
+from domain.exceptions import SharedStateError
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Expired entries are swept after this many writes
+SWEEP_EVERY = 1000
+
+
+class InMemorySharedStateStore(ISharedStateStore):
+    """
+    InMemorySharedStateStore keeps state in a dictionary of the current process.
+
+    Only correct with a single worker; it is the default so that a plain
+    `uvicorn main:app` behaves as before. Also backs the network store stand-in.
+    """
+
+    def __init__(self) -> None:
+        # key -> (value, expires_at)
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self._values: Dict[str, Tuple[str, float]] = {}
+        self._writes = 0
+
+    async def incr(self, key: str, ttl_seconds: float) -> int:
+        now = time.time()
+        value, expires_at = self._counters.get(key, (0, 0.0))
+        if expires_at <= now:
+            value, expires_at = 0, now + ttl_seconds
+        value += 1
+        self._counters[key] = (value, expires_at)
+        self._sweep(now)
+        return value
+
+    async def get(self, key: str) -> Optional[str]:
+        value, expires_at = self._values.get(key, ("", 0.0))
+        if expires_at <= time.time():
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        now = time.time()
+        self._values[key] = (value, now + ttl_seconds)
+        self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        self._writes += 1
+        if self._writes % SWEEP_EVERY == 0:
+            self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            self._values = {k: v for k, v in self._values.items() if v[1] > now}
+
+
+class SqliteSharedStateStore(ISharedStateStore):
+    """
+    SqliteSharedStateStore shares state between the worker processes of one host
+    through a SQLite database in WAL mode.
+
+    Placing the database on a tmpfs such as /dev/shm (the default when available)
+    keeps it in shared memory. Increments run in an IMMEDIATE transaction, so they are
+    atomic across processes. Blocking calls run in a worker thread.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the SQLite database file; created if missing.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_state (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+
+    async def incr(self, key: str, ttl_seconds: float) -> int:
+        return await self._run(self._incr, key, ttl_seconds)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._run(self._get, key)
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await self._run(self._set, key, value, ttl_seconds)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def _run(self, fn, *args):
+        try:
+            return await asyncio.to_thread(fn, *args)
+        except sqlite3.Error as e:
+            raise SharedStateError(str(e))
+
+    def _incr(self, key: str, ttl_seconds: float) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM shared_state WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] <= now:
+                    value, expires_at = 1, now + ttl_seconds
+                else:
+                    value, expires_at = int(row[0]) + 1, row[1]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, str(value), expires_at),
+                )
+                self._sweep(now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM shared_state WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl_seconds),
+            )
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        # Called with the lock held
+        self._writes += 1
+        if self._writes % SWEEP_EVERY == 0:
+            self._conn.execute("DELETE FROM shared_state WHERE expires_at <= ?", (now,))
+
+
+class HttpSharedStateStore(ISharedStateStore):
+    """
+    HttpSharedStateStore talks to a network state service shared by every replica.
+
+    Protocol (JSON over HTTP POST):
+        /incr  {"key", "ttl_seconds"}           -> {"value": int}
+        /get   {"key"}                          -> {"value": str | null}
+        /set   {"key", "value", "ttl_seconds"}  -> {}
+
+    `benchmarks/stubs/state_server.py` serves this protocol for local runs; a production
+    deployment can put the same protocol in front of Redis or another store.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 2.0):
+        """
+        Args:
+            base_url (str): Base URL of the state service.
+            timeout (float): Timeout in seconds for each call.
+        """
+        self.base_url = base_url.rstrip("/")
+        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=timeout)
+
+    async def incr(self, key: str, ttl_seconds: float) -> int:
+        value = await self._call("/incr", {"key": key, "ttl_seconds": ttl_seconds})
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise SharedStateError(f"/incr returned an invalid value: {value!r}")
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._call("/get", {"key": key})
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await self._call("/set", {"key": key, "value": value, "ttl_seconds": ttl_seconds})
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _call(self, path: str, body: dict):
+        try:
+            response = await self._client.post(path, json=body)
+            response.raise_for_status()
+            return response.json().get("value")
+        except (httpx.HTTPError, ValueError) as e:
+            raise SharedStateError(f"{path} failed: {e}")
+
+
+def default_sqlite_path() -> str:
+    """
+    Returns the default database path for SqliteSharedStateStore:
+    /dev/shm when the host has it, otherwise the temp directory.
+    """
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "vision-defect-shared-state.db")
+
+
+def create_shared_state_store(backend: str, sqlite_path: str = "", url: str = "") -> ISharedStateStore:
+    """
+    Builds the shared state store for the configured backend.
+
+    Args:
+        backend (str): "memory", "sqlite" or "http".
+        sqlite_path (str): Database path for the sqlite backend; defaults to default_sqlite_path().
+        url (str): Base URL for the http backend.
+
+    Returns:
+        ISharedStateStore: The store instance.
+
+    Raises:
+        ValueError: If the backend is unknown or its required setting is missing.
+    """
+    if backend == "memory":
+        return InMemorySharedStateStore()
+    if backend == "sqlite":
+        return SqliteSharedStateStore(sqlite_path or default_sqlite_path())
+    if backend == "http":
+        if not url:
+            raise ValueError("shared_state_url is required for the http shared state backend")
+        return HttpSharedStateStore(url)
+    raise ValueError(f"Unknown shared state backend: {backend}")
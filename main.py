@@ -1,21 +1,146 @@
 # main.py
+
+# Must stay the first import: times the heavy dependencies before anything else pulls them in
+from common.import_timing import import_timings, started_at
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
+from api.health_routes import router as health_router
 from api.v1.vision_routes import router
+from application.services.single_flight import SingleFlight
+from common.config import settings
 from common.error_handlers import  vision_defect_failed_handler
+from common.logging import get_logger
+from common.startup import ReadinessRegistry
 from domain.exceptions import  VisionAnalysisError,FabricRepositoryError
+from infrastructure.azure_vision_analyzer import AzureVisionAnalyzer
+from infrastructure.shared_quota import SharedQuota
+from infrastructure.shared_state import create_shared_state_store
+
+from api.middleware import add_middlewares
+
+import_timings["total"] = round((time.perf_counter() - started_at) * 1000, 2)
+
+logger = get_logger(__name__)
+
+
+async def warm_up(app: FastAPI):
+    """
+    Pre-establishes every external dependency, recording progress in app.state.readiness.
+    The vision chain is sequential (each step needs the previous one); the database and
+    shared state store warm up alongside it.
+    """
+    readiness = app.state.readiness
+    analyzer = app.state.analyzer
+
+    async def warm_up_vision():
+        await readiness.run("credential", analyzer.acquire_credential)
+        await readiness.run("secrets", analyzer.load_secrets)
+        await readiness.run("http_pool", analyzer.open_http_pool)
+
+    async def warm_up_shared_state():
+        await app.state.shared_state.incr(f"warmup:{os.getpid()}", ttl_seconds=60)
+
+    await asyncio.gather(
+        warm_up_vision(),
+        readiness.run("db_pool", app.state.repo.warm_up),
+        readiness.run("shared_state", warm_up_shared_state),
+    )
+
+
+def create_app(analyzer_factory=AzureVisionAnalyzer, repository_factory=None) -> FastAPI:
+    """
+    Builds the FastAPI application.
+
+    :param analyzer_factory: Callable returning the IVisionAnalyzer shared by all requests;
+                             receives the service-wide Azure quota as the `quota` keyword.
+    :param repository_factory: Callable returning the IFabricRepository shared by all requests.
+                               Defaults to FabricRepository on the configured connection string.
+    :return: Configured FastAPI application.
+    """
+    if repository_factory is None:
+        def repository_factory():
+            # Imported here so that apps with their own repository do not load pyodbc
+            from infrastructure.fabric_repository import FabricRepository
+            return FabricRepository(settings.fabric_connection_string)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """
+        Creates the shared analyzer and repository, warms them up in the background and
+        releases them on shutdown. Liveness is served immediately; readiness waits for warm-up.
+        """
+        logger.info(f"Import times (ms): {import_timings}")
+
+        # The per-worker Azure budget is AZURE_MAX_CONCURRENCY split across WEB_CONCURRENCY workers.
+        # `uvicorn --workers N` alone does not tell the workers N, so each would take the full budget.
+        if settings.shared_state_backend != "memory" and "web_concurrency" not in settings.model_fields_set:
+            raise RuntimeError(
+                "WEB_CONCURRENCY must be set when SHARED_STATE_BACKEND is not 'memory'; "
+                "uvicorn also uses it as its --workers default"
+            )
+        workers = settings.web_concurrency * settings.replica_count
+        if settings.azure_max_concurrency < workers:
+            raise RuntimeError(
+                f"AZURE_MAX_CONCURRENCY ({settings.azure_max_concurrency}) is smaller than "
+                f"WEB_CONCURRENCY x REPLICA_COUNT ({workers}); each worker needs at least one slot"
+            )
+
+        app.state.import_timings = import_timings
+        app.state.shared_state = create_shared_state_store(
+            settings.shared_state_backend,
+            sqlite_path=settings.shared_state_sqlite_path,
+            url=settings.shared_state_url,
+        )
+        app.state.azure_quota = SharedQuota(
+            app.state.shared_state, "azure-vision", settings.azure_max_requests_per_second
+        )
+        app.state.analyzer = analyzer_factory(quota=app.state.azure_quota)
+        app.state.repo = repository_factory()
+        app.state.single_flight = SingleFlight()
+        logger.info(
+            f"Worker {os.getpid()}: shared state backend={settings.shared_state_backend}, "
+            f"Azure concurrency budget={settings.azure_worker_concurrency} "
+            f"({settings.azure_max_concurrency} across {settings.web_concurrency} worker(s) x {settings.replica_count} replica(s))"
+        )
+        app.state.readiness = ReadinessRegistry(
+            ["credential", "secrets", "http_pool", "shared_state"],
+            attempt_timeout=settings.warmup_attempt_timeout_seconds,
+            max_backoff=settings.warmup_max_backoff_seconds,
+            # VisionService does not persist results yet (save_result is commented out),
+            # so a Fabric outage must not take replicas out of rotation
+            optional=["db_pool"],
+        )
+
+        warm_up_task = asyncio.create_task(warm_up(app))
+        yield
+
+        warm_up_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_up_task
+        await app.state.analyzer.close()
+        await app.state.shared_state.close()
+        logger.info(f"Single-flight stats: {app.state.single_flight.stats()}")
 
-from api.middleware import CorrelationMiddleware, RequestLoggingMiddleware , RateLimitingMiddleware 
+    app = FastAPI(title="Azure Vision Defect Portal", lifespan=lifespan)
 
-app = FastAPI(title="Azure Vision Defect Portal")
+    # Register middlewares
+    add_middlewares(
+        app,
+        max_requests=settings.rate_limit_max_requests,
+        window_seconds=settings.rate_limit_window_seconds,
+    )
+    app.add_exception_handler(VisionAnalysisError, vision_defect_failed_handler)
 
-# Register middlewares
-app.add_middleware(CorrelationMiddleware)
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(RateLimitingMiddleware, max_requests=5, window_seconds=30)  # optional usage
-app.add_exception_handler(VisionAnalysisError, vision_defect_failed_handler)
+    app.include_router(health_router)
+    app.include_router(router, prefix="/api/v1")
+    return app
 
-app.include_router(router, prefix="/api/v1")
 
+app = create_app()
 
 
 # note: uvicorn vision-defect-detection.main:app --reload --port 8000
@@ -0,0 +1,111 @@
+# tests/unit/test_middleware.py
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.health_routes import router as health_router
+from api.middleware import add_middlewares
+from common.logging import CorrelationIdFilter
+from domain.exceptions import SharedStateError
+from infrastructure.shared_state import InMemorySharedStateStore
+
+class CapturingHandler(logging.Handler):
+    """
+    Records (correlation ID, message) for every log line, using the same
+    filter as the application's handler.
+    """
+    def __init__(self):
+        super().__init__()
+        self.addFilter(CorrelationIdFilter())
+        self.lines = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append((record.cid, record.getMessage()))
+
+@pytest.fixture
+def logs():
+    handler = CapturingHandler()
+    logger = logging.getLogger("api.middleware")
+    logger.addHandler(handler)
+    yield handler.lines
+    logger.removeHandler(handler)
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch):
+    """
+    Keeps every request in the same rate-limit window (window 16 of 60 s, reset at 1020).
+    """
+    monkeypatch.setattr("api.middleware.time.time", lambda: 1000.5)
+
+class FailingStore(InMemorySharedStateStore):
+    """
+    A shared state store that is unreachable.
+    """
+    async def incr(self, key: str, ttl_seconds: float) -> int:
+        raise SharedStateError("store unavailable")
+
+def make_client(max_requests: int = 2, store=None) -> TestClient:
+    app = FastAPI()
+    app.state.shared_state = store or InMemorySharedStateStore()
+    add_middlewares(app, max_requests=max_requests, window_seconds=60)
+    app.include_router(health_router)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return TestClient(app)
+
+def test_request_log_and_rate_limited_response_carry_correlation_id(logs):
+    """
+    The correlation ID reaches the request log and the X-Correlation-ID header,
+    including on responses rejected by the rate limiter.
+    """
+    client = make_client(max_requests=1)
+
+    ok = client.get("/ping", headers={"X-Correlation-ID": "cid-1"})
+    limited = client.get("/ping", headers={"X-Correlation-ID": "cid-2"})
+
+    assert ok.headers["X-Correlation-ID"] == "cid-1"
+    assert limited.status_code == 429
+    assert limited.headers["X-Correlation-ID"] == "cid-2"
+    completed = [(cid, message) for cid, message in logs if "GET /ping completed" in message]
+    assert [cid for cid, _ in completed] == ["cid-1", "cid-2"]
+
+def test_requests_over_the_limit_get_429_with_rate_limit_headers():
+    """
+    The first max_requests requests pass with decreasing X-RateLimit-Remaining;
+    the next one is rejected with 429 and the same headers.
+    """
+    client = make_client(max_requests=2)
+
+    responses = [client.get("/ping") for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert [r.headers["X-RateLimit-Remaining"] for r in responses] == ["1", "0", "0"]
+    assert all(r.headers["X-RateLimit-Limit"] == "2" for r in responses)
+    assert all(r.headers["X-RateLimit-Reset"] == "1020" for r in responses)
+    assert responses[2].json() == {"detail": "Too many requests"}
+
+def test_probes_are_not_rate_limited():
+    """
+    /healthz is never throttled and does not count against the client's limit.
+    """
+    client = make_client(max_requests=1)
+
+    probes = [client.get("/healthz") for _ in range(5)]
+
+    assert all(r.status_code == 200 for r in probes)
+    assert "X-RateLimit-Limit" not in probes[0].headers
+    assert client.get("/ping").status_code == 200
+
+def test_requests_pass_when_the_store_is_unavailable():
+    """
+    The limiter fails open: requests are served, without rate-limit headers.
+    """
+    client = make_client(max_requests=1, store=FailingStore())
+
+    responses = [client.get("/ping") for _ in range(3)]
+
+    assert all(r.status_code == 200 for r in responses)
+    assert "X-RateLimit-Limit" not in responses[0].headers
@@ -0,0 +1,113 @@
+# tests/unit/test_shared_state.py
+import asyncio
+import multiprocessing
+import httpx
+import pytest
+from domain.exceptions import SharedStateError
+from infrastructure.shared_quota import SharedQuota
+from infrastructure.shared_state import HttpSharedStateStore, InMemorySharedStateStore, SqliteSharedStateStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """
+    Each test runs against both single-host backends.
+    """
+    if request.param == "memory":
+        return InMemorySharedStateStore()
+    return SqliteSharedStateStore(str(tmp_path / "state.db"))
+
+@pytest.mark.asyncio
+async def test_incr_counts_until_expiry(store):
+    assert await store.incr("k", ttl_seconds=0.2) == 1
+    assert await store.incr("k", ttl_seconds=0.2) == 2
+
+    await asyncio.sleep(0.25)
+
+    # An expired counter starts again from 1
+    assert await store.incr("k", ttl_seconds=0.2) == 1
+
+@pytest.mark.asyncio
+async def test_set_and_get_respect_ttl(store):
+    assert await store.get("missing") is None
+
+    await store.set("k", "value", ttl_seconds=0.2)
+    assert await store.get("k") == "value"
+
+    await asyncio.sleep(0.25)
+    assert await store.get("k") is None
+
+def _increment_many(path: str, times: int) -> None:
+    async def run():
+        store = SqliteSharedStateStore(path)
+        for _ in range(times):
+            await store.incr("shared", ttl_seconds=60)
+        await store.close()
+    asyncio.run(run())
+
+@pytest.mark.asyncio
+async def test_sqlite_incr_is_atomic_across_processes(tmp_path):
+    """
+    Several worker processes incrementing the same counter never lose an update.
+    """
+    path = str(tmp_path / "state.db")
+    SqliteSharedStateStore(path)  # create the schema before the workers start
+
+    workers = [multiprocessing.Process(target=_increment_many, args=(path, 200)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    store = SqliteSharedStateStore(path)
+    assert await store.incr("shared", ttl_seconds=60) == 4 * 200 + 1
+
+@pytest.mark.asyncio
+async def test_quota_holds_calls_to_limit_per_second(monkeypatch):
+    """
+    Within one second only `limit_per_second` callers get a token; the rest wait.
+    """
+    monkeypatch.setattr("infrastructure.shared_quota.time.time", lambda: 1000.5)
+    quota = SharedQuota(InMemorySharedStateStore(), "test", limit_per_second=3)
+
+    results = await asyncio.gather(*[
+        asyncio.wait_for(quota.acquire(), timeout=0.05) for _ in range(5)
+    ], return_exceptions=True)
+
+    assert sum(1 for r in results if r is None) == 3
+    assert sum(1 for r in results if isinstance(r, asyncio.TimeoutError)) == 2
+
+@pytest.mark.asyncio
+async def test_quota_reserves_overflow_in_later_windows(monkeypatch):
+    """
+    Callers beyond the limit reserve a slot in the window the backlog reaches,
+    instead of polling the current one.
+    """
+    monkeypatch.setattr("infrastructure.shared_quota.time.time", lambda: 1000.5)
+    store = InMemorySharedStateStore()
+    quota = SharedQuota(store, "test", limit_per_second=2)
+
+    await asyncio.gather(*[
+        asyncio.wait_for(quota.acquire(), timeout=0.05) for _ in range(7)
+    ], return_exceptions=True)
+
+    # Windows 1001 and 1002 are full; the seventh caller holds the first slot of 1003
+    assert await store.incr("quota:test:1001", ttl_seconds=10) == 3
+    assert await store.incr("quota:test:1002", ttl_seconds=10) == 3
+    assert await store.incr("quota:test:1003", ttl_seconds=10) == 2
+
+@pytest.mark.asyncio
+async def test_http_incr_without_value_raises_shared_state_error():
+    """
+    A reply without a counter value surfaces as SharedStateError, which callers
+    handle, rather than a TypeError.
+    """
+    store = HttpSharedStateStore("http://state")
+    await store.close()
+    store._client = httpx.AsyncClient(
+        base_url="http://state",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+    )
+
+    with pytest.raises(SharedStateError):
+        await store.incr("k", ttl_seconds=1)
+    await store.close()
@@ -0,0 +1,133 @@
+# tests/unit/test_single_flight.py
+import asyncio
+import base64
+import pytest
+from application.services.single_flight import SingleFlight
+from application.services.vision_service import VisionService
+from application.dto.image_request_dto import ImageRequestDTO
+from domain.contracts.i_vision_analyzer import IVisionAnalyzer
+from domain.contracts.i_fabric_repository import IFabricRepository
+from domain.entities.defect_result import DefectResult
+from datetime import datetime
+
+class CountingAnalyzer(IVisionAnalyzer):
+    """
+    A fake IVisionAnalyzer that counts upstream calls and blocks until released,
+    so that concurrent requests overlap.
+    """
+    def __init__(self, error: Exception | None = None):
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+        self.error = error
+
+    async def analyze_image(self, image_bytes: bytes) -> DefectResult:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return DefectResult(
+            image_id=f"img-{self.calls}",
+            timestamp=datetime.utcnow(),
+            is_defective=True,
+            probabilities={"scratch": 0.9},
+            raw_response={}
+        )
+
+class FakeRepo(IFabricRepository):
+    async def save_result(self, result: DefectResult) -> None:
+        return None
+
+def make_request(data: bytes) -> ImageRequestDTO:
+    return ImageRequestDTO(image_base64=base64.b64encode(data).decode())
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_requests_share_one_analysis():
+    """
+    Many concurrent inspections of the same image make a single analyzer call
+    and all receive its result.
+    """
+    analyzer = CountingAnalyzer()
+    single_flight = SingleFlight()
+    req = make_request(b"same-frame")
+
+    tasks = [
+        asyncio.create_task(VisionService(analyzer, FakeRepo(), single_flight).inspect_image(req))
+        for _ in range(50)
+    ]
+    await asyncio.sleep(0)
+    analyzer.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert analyzer.calls == 1
+    assert {r.image_id for r in results} == {"img-1"}
+    assert single_flight.stats() == {"executed": 1, "coalesced": 49, "abandoned": 0, "in_flight": 0}
+
+@pytest.mark.asyncio
+async def test_different_images_are_not_coalesced():
+    analyzer = CountingAnalyzer()
+    analyzer.release.set()
+    service = VisionService(analyzer, FakeRepo(), SingleFlight())
+
+    await asyncio.gather(
+        service.inspect_image(make_request(b"frame-a")),
+        service.inspect_image(make_request(b"frame-b")),
+    )
+
+    assert analyzer.calls == 2
+
+@pytest.mark.asyncio
+async def test_error_is_raised_to_every_waiter():
+    analyzer = CountingAnalyzer(error=RuntimeError("upstream failed"))
+    single_flight = SingleFlight()
+
+    tasks = [asyncio.create_task(single_flight.do("k", lambda: analyzer.analyze_image(b""))) for _ in range(5)]
+    await asyncio.sleep(0)
+    analyzer.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert analyzer.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert single_flight.stats()["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_does_not_affect_the_others():
+    analyzer = CountingAnalyzer()
+    single_flight = SingleFlight()
+
+    first = asyncio.create_task(single_flight.do("k", lambda: analyzer.analyze_image(b"")))
+    second = asyncio.create_task(single_flight.do("k", lambda: analyzer.analyze_image(b"")))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    analyzer.release.set()
+
+    assert (await second).image_id == "img-1"
+    assert first.cancelled()
+    assert analyzer.cancelled == 0
+
+@pytest.mark.asyncio
+async def test_cancelling_every_waiter_cancels_the_analysis():
+    analyzer = CountingAnalyzer()
+    single_flight = SingleFlight()
+
+    tasks = [asyncio.create_task(single_flight.do("k", lambda: analyzer.analyze_image(b""))) for _ in range(3)]
+    while analyzer.calls == 0:
+        await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert analyzer.cancelled == 1
+    assert single_flight.stats() == {"executed": 1, "coalesced": 2, "abandoned": 1, "in_flight": 0}
+
+    # A later request for the same key starts a fresh analysis
+    analyzer.release.set()
+    result = await single_flight.do("k", lambda: analyzer.analyze_image(b""))
+    assert result.image_id == "img-2"
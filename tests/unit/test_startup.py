@@ -0,0 +1,93 @@
+# tests/unit/test_startup.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.health_routes import router as health_router
+from common.startup import ReadinessRegistry
+
+class FlakyStep:
+    """
+    A warm-up step that fails a given number of times before succeeding.
+    """
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self) -> None:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("dependency unavailable")
+
+def make_registry() -> ReadinessRegistry:
+    return ReadinessRegistry(
+        ["secrets"], attempt_timeout=1.0, max_backoff=0.01, optional=["db_pool"]
+    )
+
+def make_app(readiness: ReadinessRegistry) -> FastAPI:
+    app = FastAPI()
+    app.state.readiness = readiness
+    app.state.import_timings = {"fastapi": 1.0}
+    app.include_router(health_router)
+    return app
+
+@pytest.mark.asyncio
+async def test_failed_step_is_retried_until_ready():
+    """
+    A step that fails once is retried after the backoff and ends up ready,
+    with both attempts recorded.
+    """
+    registry = make_registry()
+    step = FlakyStep(failures=1)
+
+    await registry.run("secrets", step)
+
+    state = registry.snapshot()["secrets"]
+    assert step.calls == 2
+    assert state["status"] == "ready"
+    assert state["attempts"] == 2
+    assert state["error"] is None
+    assert registry.is_ready
+
+@pytest.mark.asyncio
+async def test_optional_dependency_does_not_gate_readiness():
+    """
+    The service is ready once the required dependencies are, even while an
+    optional one has not warmed up.
+    """
+    registry = make_registry()
+    assert not registry.is_ready
+
+    await registry.run("secrets", FlakyStep(failures=0))
+
+    assert registry.is_ready
+    assert registry.snapshot()["db_pool"]["status"] == "pending"
+
+@pytest.mark.asyncio
+async def test_readyz_returns_503_until_required_dependencies_are_warm():
+    """
+    /readyz answers 503 while a required dependency is failing and 200 once it
+    has recovered, without waiting for the optional DB pool.
+    """
+    registry = make_registry()
+    client = TestClient(make_app(registry))
+    probes = []
+
+    class ProbingStep(FlakyStep):
+        """Reads the probe on the retry, after the first attempt has failed."""
+        async def __call__(self) -> None:
+            if self.calls == 1:
+                probes.append(client.get("/readyz"))
+            await super().__call__()
+
+    await registry.run("secrets", ProbingStep(failures=1))
+
+    not_ready = probes[0]
+    assert not_ready.status_code == 503
+    assert not_ready.json()["status"] == "not_ready"
+    assert not_ready.json()["dependencies"]["secrets"]["status"] == "failed"
+
+    ready = client.get("/readyz")
+    assert ready.status_code == 200
+    assert ready.json()["status"] == "ready"
+    assert ready.json()["dependencies"]["db_pool"]["status"] == "pending"
+    assert ready.json()["import_ms"] == {"fastapi": 1.0}
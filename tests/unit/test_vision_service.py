@@ -1,11 +1,13 @@
 # tests/unit/test_vision_service.py
 import pytest
 import base64
+import hashlib
 from application.services.vision_service import VisionService
 from application.dto.image_request_dto import ImageRequestDTO
 from domain.contracts.i_vision_analyzer import IVisionAnalyzer
 from domain.contracts.i_fabric_repository import IFabricRepository
 from domain.entities.defect_result import DefectResult
+from infrastructure.shared_state import InMemorySharedStateStore
 from datetime import datetime
 
 class FakeAnalyzer(IVisionAnalyzer):
@@ -13,12 +15,17 @@ class FakeAnalyzer(IVisionAnalyzer):
     A mock implementation of IVisionAnalyzer for testing purposes.
     Always returns a DefectResult indicating the image is defective.
     """
+    def __init__(self):
+        self.calls = 0
+
     async def analyze_image(self, image_bytes: bytes) -> DefectResult:
+        self.calls += 1
         return DefectResult(
             image_id="1",
             timestamp=datetime.utcnow(),
             is_defective=True,
-            probabilities={"defect": 0.95, "clean": 0.05}
+            probabilities={"defect": 0.95, "clean": 0.05},
+            raw_response={}
         )
 
 class FakeRepo(IFabricRepository):
@@ -45,3 +52,36 @@ async def test_service_flags_defect_and_saves():
 
     # Assert that the result indicates a defect
     assert result.is_defective
+
+@pytest.mark.asyncio
+async def test_cached_result_skips_the_analyzer():
+    """
+    A result cached in the shared state store by one worker is served to another
+    worker without calling the analyzer again.
+    """
+    store = InMemorySharedStateStore()
+    req = ImageRequestDTO(image_base64=base64.b64encode(b"dummydata").decode())
+    first_analyzer, second_analyzer = FakeAnalyzer(), FakeAnalyzer()
+
+    first = await VisionService(first_analyzer, FakeRepo(), shared_state=store, cache_ttl_seconds=60).inspect_image(req)
+    second = await VisionService(second_analyzer, FakeRepo(), shared_state=store, cache_ttl_seconds=60).inspect_image(req)
+
+    assert first_analyzer.calls == 1
+    assert second_analyzer.calls == 0
+    assert second.image_id == first.image_id
+
+@pytest.mark.asyncio
+async def test_invalid_cached_result_counts_as_miss():
+    """
+    A cache entry that no longer parses is ignored and the image is analyzed again.
+    """
+    store = InMemorySharedStateStore()
+    data = b"dummydata"
+    await store.set(f"result:{hashlib.sha256(data).hexdigest()}", '{"stale": true}', ttl_seconds=60)
+    analyzer = FakeAnalyzer()
+    service = VisionService(analyzer, FakeRepo(), shared_state=store, cache_ttl_seconds=60)
+
+    result = await service.inspect_image(ImageRequestDTO(image_base64=base64.b64encode(data).decode()))
+
+    assert analyzer.calls == 1
+    assert result.image_id == "1"